@@ -0,0 +1,37 @@
+"""imagens de produtos em jsonb
+
+Revision ID: 3d732abb6f73
+Revises: f06d13f0e0f6
+Create Date: 2026-10-14 12:34:51.902174
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d732abb6f73'
+down_revision: Union[str, None] = 'f06d13f0e0f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        'produtos', 'imagens',
+        existing_type=sa.JSON(), type_=postgresql.JSONB(),
+        existing_nullable=True, postgresql_using='imagens::jsonb'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'produtos', 'imagens',
+        existing_type=postgresql.JSONB(), type_=sa.JSON(),
+        existing_nullable=True, postgresql_using='imagens::json'
+    )
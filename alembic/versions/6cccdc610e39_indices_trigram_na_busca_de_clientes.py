@@ -0,0 +1,37 @@
+"""indices trigram na busca de clientes
+
+Revision ID: 6cccdc610e39
+Revises: 39b61d31148c
+Create Date: 2026-10-14 10:12:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6cccdc610e39'
+down_revision: Union[str, None] = '39b61d31148c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_clients_nome_trgm', 'clients', [sa.text('lower(nome) gin_trgm_ops')],
+        unique=False, postgresql_using='gin'
+    )
+    op.create_index(
+        'ix_clients_email_trgm', 'clients', [sa.text('lower(email) gin_trgm_ops')],
+        unique=False, postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_clients_email_trgm', table_name='clients', postgresql_using='gin')
+    op.drop_index('ix_clients_nome_trgm', table_name='clients', postgresql_using='gin')
@@ -0,0 +1,52 @@
+"""disponibilidade gerada pelo estoque
+
+Revision ID: a6f31c8e7d54
+Revises: 5e9a0d3b6c18
+Create Date: 2026-10-14 14:02:37.915260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6f31c8e7d54'
+down_revision: Union[str, None] = '5e9a0d3b6c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _criar_indices() -> None:
+    op.create_index(
+        'ix_produtos_categoria_disponibilidade_live', 'produtos', ['categoria', 'disponibilidade'],
+        unique=False, postgresql_where=sa.text('deleted = false')
+    )
+    op.create_index(
+        'ix_produtos_disponiveis', 'produtos', ['id'],
+        unique=False, postgresql_where=sa.text('deleted = false AND disponibilidade = true')
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Uma coluna existente não pode virar gerada; o DROP COLUMN também remove
+    # os índices que dependem dela, recriados em seguida.
+    op.drop_column('produtos', 'disponibilidade')
+    op.add_column(
+        'produtos',
+        sa.Column('disponibilidade', sa.Boolean(), sa.Computed('estoque > 0', persisted=True), nullable=False)
+    )
+    _criar_indices()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('produtos', 'disponibilidade')
+    op.add_column(
+        'produtos',
+        sa.Column('disponibilidade', sa.Boolean(), server_default=sa.text('true'), nullable=False)
+    )
+    op.execute('UPDATE produtos SET disponibilidade = estoque > 0')
+    _criar_indices()
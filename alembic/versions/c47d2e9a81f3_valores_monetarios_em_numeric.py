@@ -0,0 +1,44 @@
+"""valores monetarios em numeric
+
+Revision ID: c47d2e9a81f3
+Revises: 8b1e5f0c2a47
+Create Date: 2026-10-14 13:07:42.508391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47d2e9a81f3'
+down_revision: Union[str, None] = '8b1e5f0c2a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUNAS = (
+    ('produtos', 'preco'),
+    ('itens_pedidos', 'preco'),
+    ('pedidos', 'preco_total'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for tabela, coluna in COLUNAS:
+        op.alter_column(
+            tabela, coluna,
+            existing_type=sa.Float(), type_=sa.Numeric(12, 2),
+            existing_nullable=False, postgresql_using=f'round({coluna}::numeric, 2)'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for tabela, coluna in COLUNAS:
+        op.alter_column(
+            tabela, coluna,
+            existing_type=sa.Numeric(12, 2), type_=sa.Float(),
+            existing_nullable=False, postgresql_using=f'{coluna}::double precision'
+        )
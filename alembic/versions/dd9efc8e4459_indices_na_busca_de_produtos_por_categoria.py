@@ -0,0 +1,37 @@
+"""indices na busca de produtos por categoria
+
+Revision ID: dd9efc8e4459
+Revises: 4c2eeb00540a
+Create Date: 2026-10-14 11:32:18.540117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dd9efc8e4459'
+down_revision: Union[str, None] = '4c2eeb00540a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_produtos_categoria_trgm', 'produtos', [sa.text('categoria gin_trgm_ops')],
+        unique=False, postgresql_using='gin'
+    )
+    op.create_index(
+        'ix_produtos_categoria_live', 'produtos', ['categoria'],
+        unique=False, postgresql_where=sa.text('deleted = false')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_produtos_categoria_live', table_name='produtos', postgresql_where=sa.text('deleted = false'))
+    op.drop_index('ix_produtos_categoria_trgm', table_name='produtos', postgresql_using='gin')
@@ -0,0 +1,48 @@
+"""indices compostos de produtos e pedidos
+
+Revision ID: f06d13f0e0f6
+Revises: 532f33e49aa1
+Create Date: 2026-10-14 12:20:07.331846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f06d13f0e0f6'
+down_revision: Union[str, None] = '532f33e49aa1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Os índices compostos começam pela mesma coluna dos índices parciais antigos,
+    # então substituem esses índices nas buscas só por categoria ou só por cliente.
+    op.create_index(
+        'ix_produtos_categoria_disponibilidade_live', 'produtos', ['categoria', 'disponibilidade'],
+        unique=False, postgresql_where=sa.text('deleted = false')
+    )
+    op.drop_index('ix_produtos_categoria_live', table_name='produtos', postgresql_where=sa.text('deleted = false'))
+    op.create_index(
+        'ix_pedidos_cliente_id_status_live', 'pedidos', ['cliente_id', 'status'],
+        unique=False, postgresql_where=sa.text('deleted = false')
+    )
+    op.drop_index('ix_pedidos_cliente_id_live', table_name='pedidos', postgresql_where=sa.text('deleted = false'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'ix_pedidos_cliente_id_live', 'pedidos', ['cliente_id'],
+        unique=False, postgresql_where=sa.text('deleted = false')
+    )
+    op.drop_index('ix_pedidos_cliente_id_status_live', table_name='pedidos', postgresql_where=sa.text('deleted = false'))
+    op.create_index(
+        'ix_produtos_categoria_live', 'produtos', ['categoria'],
+        unique=False, postgresql_where=sa.text('deleted = false')
+    )
+    op.drop_index('ix_produtos_categoria_disponibilidade_live', table_name='produtos', postgresql_where=sa.text('deleted = false'))
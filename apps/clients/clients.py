@@ -1,26 +1,56 @@
 from fastapi import Depends, HTTPException, APIRouter, Query
-from fastapi.responses import JSONResponse 
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, exists, bindparam
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import raiseload
 from typing import Optional
 
 from database import get_session
 from models import Client
-from helpers.validacao import verificar_campos_obrigatorios
-from helpers.security import verificar_token
+from schemas import ClienteResponse, ClientesResponse, ClienteCreate, ClienteUpdate
+from helpers.security import usuario_autenticado
+from helpers.resposta import ORJSONResponse
 
 
 router = APIRouter()
 
+_CPF_STRIP = str.maketrans("", "", ".-/")
 
-@router.get("/")
-def buscar_clientes(
+
+def _cliente_out(cliente):
+    # Fronteira de confiança: os corpos de requisição são validados pelos modelos
+    # Pydantic na entrada; o que sai do banco já está no formato do ClienteOut e é
+    # serializado direto, sem uma nova validação. O response_model de cada rota
+    # continua declarado apenas para documentar o contrato no OpenAPI.
+    return {
+        "id": cliente.id,
+        "nome": cliente.nome,
+        "email": cliente.email,
+        "cpf": cliente.cpf
+    }
+
+# Comandos montados uma única vez na importação; os handlers só acrescentam
+# filtros ou informam os parâmetros.
+_BUSCAR_CLIENTES = select(
+    Client.id, Client.nome, Client.email, Client.cpf,
+    func.count().over().label("total")
+).where(Client.deleted == False)
+
+_OUTROS_CLIENTES = (Client.id != bindparam("id")) & (Client.deleted == False)
+_CPF_EMAIL_EM_USO = select(
+    exists().where(_OUTROS_CLIENTES & (Client.cpf == bindparam("cpf"))),
+    exists().where(_OUTROS_CLIENTES & (Client.email == bindparam("email")))
+)
+
+
+@router.get("/", response_model=ClientesResponse)
+async def buscar_clientes(
     nome: Optional[str] = Query(None),
     email: Optional[str] = Query(None),
     limit: int = Query(10, ge=1),
     offset: int = Query(0, ge=0),
-    session: Session = Depends(get_session),
-    usuario: str = Depends(verificar_token)):
+    session: AsyncSession = Depends(get_session),
+    usuario: str = Depends(usuario_autenticado)):
     """
     Busca uma lista de clientes com filtros opcionais.
 
@@ -29,26 +59,27 @@ def buscar_clientes(
     - email (str, opcional): Filtro parcial pelo e-mail do cliente.
     - limit (int, padrão=10): Quantidade máxima de registros retornados.
     - offset (int, padrão=0): Ponto de partida para a busca.
-    - session (Session): Sessão do banco de dados (injeção de dependência).
-    - usuario (str): Nome de usuário injetado automaticamente via Depends(verificar_token).
-        Garante que apenas usuários autenticados possam acessar este endpoint.
+    - session (AsyncSession): Sessão do banco de dados (injeção de dependência).
+    - usuario (str): Nome de usuário injetado automaticamente via Depends(usuario_autenticado).
+        O token já foi validado pelo `verificar_token` aplicado a todo o router.
 
     Retorna:
-    - JSONResponse com status, mensagem, quantidade total e lista de clientes.
+    - ClientesResponse com status, mensagem, quantidade total e lista de clientes.
+        O total considera todos os clientes que atendem aos filtros, não apenas a página retornada.
     - HTTP 404 se nenhum cliente for encontrado.
     """
     
-    query = select(Client).where(Client.deleted == False)
+    query = _BUSCAR_CLIENTES
     
     if nome:
-        query = query.where(Client.nome.ilike(f"%{nome}%"))
+        query = query.where(func.lower(Client.nome).like(f"%{nome.lower()}%"))
 
     if email:
-        query = query.where(Client.email.ilike(f"%{email}%"))
+        query = query.where(func.lower(Client.email).like(f"%{email.lower()}%"))
 
     query = query.limit(limit).offset(offset)
 
-    db_clients = session.scalars(query).all()
+    db_clients = (await session.execute(query)).all()
 
     if len(db_clients) == 0:
         raise HTTPException(
@@ -56,49 +87,34 @@ def buscar_clientes(
             detail="Clientes não encontrados com os parâmetros solicitados!"
         )
     
-    clientes = [
-        {
-            "id": client.id,
-            "nome": client.nome,
-            "email": client.email,
-            "cpf": client.cpf
-        }
-        for client in db_clients
-    ]
-    
     response = {
         "status": "success",
         "usuario": usuario,
         "message": "Clientes encontrados com sucesso.",
-        "total": len(clientes),
-        "clientes": clientes
+        "total": db_clients[0].total,
+        "clientes": [_cliente_out(db_client) for db_client in db_clients]
     }
     
-    return JSONResponse(content=response, status_code=200)
+    return ORJSONResponse(content=response, status_code=200)
 
-
-@router.get("/{id}")
-def buscar_cliente_por_id(id: int, session: Session = Depends(get_session), usuario: str = Depends(verificar_token)):
+@router.get("/{id}", response_model=ClienteResponse)
+async def buscar_cliente_por_id(id: int, session: AsyncSession = Depends(get_session), usuario: str = Depends(usuario_autenticado)):
     """
     Busca um cliente pelo ID.
 
     Parâmetros:
     - id (int): ID do cliente a ser buscado.
-    - session (Session): Sessão do banco de dados (injeção de dependência).
-    - usuario (str): Nome de usuário injetado automaticamente via Depends(verificar_token).
-        Garante que apenas usuários autenticados possam acessar este endpoint.
+    - session (AsyncSession): Sessão do banco de dados (injeção de dependência).
+    - usuario (str): Nome de usuário injetado automaticamente via Depends(usuario_autenticado).
+        O token já foi validado pelo `verificar_token` aplicado a todo o router.
 
     Retorna:
-    - JSONResponse com status, mensagem e dados do cliente.
+    - ClienteResponse com status, mensagem e dados do cliente.
     - HTTP 404 se o cliente não for encontrado.
     """
-    db_client = session.scalar(
-        select(Client).where(
-            (Client.id == id) & (Client.deleted == False)
-        )
-    )
+    db_client = await session.get(Client, id, options=[raiseload("*")])
     
-    if not db_client:
+    if db_client is None or db_client.deleted:
         raise HTTPException(
             status_code=404,
             detail="Cliente não encontrado!"
@@ -108,201 +124,155 @@ def buscar_cliente_por_id(id: int, session: Session = Depends(get_session), usua
         "status": "success",
         "message": "Cliente encontrado com sucesso.",
         "usuario": usuario,
-        "cliente": {
-            "id": db_client.id,
-            "email": db_client.email,
-            "cpf": db_client.cpf,
-            "nome": db_client.nome
-        }
+        "cliente": _cliente_out(db_client)
     }
     
-    return JSONResponse(content=response, status_code=200)
+    return ORJSONResponse(content=response, status_code=200)
 
-
-@router.post("/")
-def criar_cliente(body: dict, session: Session = Depends(get_session), usuario: str = Depends(verificar_token)):
+@router.post("/", response_model=ClienteResponse, status_code=201)
+async def criar_cliente(body: ClienteCreate, session: AsyncSession = Depends(get_session), usuario: str = Depends(usuario_autenticado)):
     """
-    Cria um novo cliente, validando campos obrigatórios e duplicidade.
+    Cria um novo cliente, validando duplicidade.
 
     Parâmetros:
-    - body (dict): Dados do cliente contendo 'email', 'cpf' e 'nome'.
-    - session (Session): Sessão do banco de dados (injeção de dependência).
-    - usuario (str): Nome de usuário injetado automaticamente via Depends(verificar_token).
-        Garante que apenas usuários autenticados possam acessar este endpoint.
+    - body (ClienteCreate): Dados do cliente contendo 'email', 'cpf' e 'nome'.
+    - session (AsyncSession): Sessão do banco de dados (injeção de dependência).
+    - usuario (str): Nome de usuário injetado automaticamente via Depends(usuario_autenticado).
+        O token já foi validado pelo `verificar_token` aplicado a todo o router.
 
     Retorna:
-    - JSONResponse com status, mensagem e dados do cliente criado.
-    - HTTP 400 se faltar campos obrigatórios.
+    - ClienteResponse com status, mensagem e dados do cliente criado.
+    - HTTP 422 se faltar campos obrigatórios ou algum campo for inválido.
     - HTTP 409 se cliente já estiver cadastrado.
     """
-    obrigatorios = ["email", "cpf", "nome"]
-    validacao = verificar_campos_obrigatorios(obrigatorios=obrigatorios, body=body)
-    
-    if not validacao:
-        raise HTTPException(
-            status_code=400,
-            detail="Informação obrigatória para cadastro não informada."
-        )
+    cpf = body.cpf.translate(_CPF_STRIP)
     
-    cpf = body["cpf"].replace("-", "").replace(".", "")
-    
-    db_client = session.scalar(
-        select(Client).where(
-            ((Client.email == body["email"]) | (Client.cpf == cpf)) & (Client.deleted == False)
-        )
+    # O ON CONFLICT cobre os índices únicos parciais de email e cpf, então a
+    # checagem de duplicidade e o cadastro acontecem em um único comando.
+    db_client = await session.scalar(
+        insert(Client)
+        .values(email=body.email, cpf=cpf, nome=body.nome)
+        .on_conflict_do_nothing()
+        .returning(Client)
     )
     
-    if db_client:
+    if not db_client:
         raise HTTPException(
             status_code=409,
             detail="Cliente com essas informações já cadastrado!"
         )
     
-    db_client = Client(
-        email=body["email"],
-        cpf=cpf,
-        nome=body["nome"]
-    )
-    
-    session.add(db_client)
-    session.commit()
-    session.refresh(db_client)
+    await session.commit()
     
     response = {
         "status": "success",
         "message": "Cliente cadastrado com sucesso.",
         "usuario": usuario,
-        "cliente": {
-            "id": db_client.id,
-            "email": db_client.email,
-            "cpf": cpf,
-            "nome": db_client.nome
-        }
+        "cliente": _cliente_out(db_client)
     }
     
-    return JSONResponse(content=response, status_code=201)
-
+    return ORJSONResponse(content=response, status_code=201)
 
-@router.put("/{id}")
-def atualizar_cliente(id: int, body: dict, session: Session = Depends(get_session),
-                      usuario: str = Depends(verificar_token)):
+@router.put("/{id}", response_model=ClienteResponse)
+async def atualizar_cliente(id: int, body: ClienteUpdate, session: AsyncSession = Depends(get_session),
+                      usuario: str = Depends(usuario_autenticado)):
     """
     Atualiza os dados de um cliente existente.
 
     Parâmetros:
     - id (int): ID do cliente a ser atualizado.
-    - body (dict): Dados que devem ser atualizados.
-    - session (Session): Sessão do banco de dados (injeção de dependência).
-    - usuario (str): Nome de usuário injetado automaticamente via Depends(verificar_token).
-        Garante que apenas usuários autenticados possam acessar este endpoint.
+    - body (ClienteUpdate): Dados que devem ser atualizados.
+    - session (AsyncSession): Sessão do banco de dados (injeção de dependência).
+    - usuario (str): Nome de usuário injetado automaticamente via Depends(usuario_autenticado).
+        O token já foi validado pelo `verificar_token` aplicado a todo o router.
 
     Retorna:
-    - JSONResponse com status, mensagem e dados do cliente atualizado.
+    - ClienteResponse com status, mensagem e dados do cliente atualizado.
     - HTTP 404 se o cliente não for encontrado.
     - HTTP 409 se houver conflito de CPF ou email.
+    - HTTP 422 se algum campo for inválido.
     """
-    db_client = session.scalar(
-        select(Client).where(
-            (Client.id == id) & (Client.deleted == False)
-        )
-    )
+    db_client = await session.get(Client, id, options=[raiseload("*")])
 
-    if not db_client:
+    if db_client is None or db_client.deleted:
         raise HTTPException(
             status_code=404,
             detail="Cliente não encontrado!"
         )
 
-    for chave, valor in body.items():
-        if chave == "cpf":
-            cpf = valor.replace("-", "").replace(".", "")
-            db_client_validacao = session.scalar(
-                select(Client).where(
-                    (Client.cpf == cpf) & (Client.deleted == False) & (Client.id != id)
-                )
+    dados = body.model_dump(exclude_none=True)
+    cpf = dados.get("cpf")
+    email = dados.get("email")
+
+    if cpf is not None:
+        cpf = dados["cpf"] = cpf.translate(_CPF_STRIP)
+
+    if cpf is not None or email is not None:
+        cpf_em_uso, email_em_uso = (await session.execute(
+            _CPF_EMAIL_EM_USO, {"id": id, "cpf": cpf, "email": email}
+        )).one()
+
+        if cpf_em_uso:
+            raise HTTPException(
+                status_code=409,
+                detail="Cliente com esse CPF já cadastrado!"
             )
-            if db_client_validacao:
-                raise HTTPException(
-                    status_code=409,
-                    detail="Cliente com esse CPF já cadastrado!"
-                )
-            valor = cpf
-
-        if chave == "email":
-            db_client_validacao = session.scalar(
-                select(Client).where(
-                    (Client.email == valor) & (Client.deleted == False) & (Client.id != id)
-                )
+        if email_em_uso:
+            raise HTTPException(
+                status_code=409,
+                detail="Cliente com esse email já cadastrado!"
             )
-            if db_client_validacao:
-                raise HTTPException(
-                    status_code=409,
-                    detail="Cliente com esse email já cadastrado!"
-                )
-
-        if not hasattr(db_client, chave):
-            continue
+
+    for chave, valor in dados.items():
         setattr(db_client, chave, valor)
 
-    session.commit()
-    session.refresh(db_client)
+    await session.commit()
 
     response = {
         "status": "success",
         "message": "Cliente alterado com sucesso.",
         "usuario": usuario,
-        "cliente": {
-            "id": db_client.id,
-            "email": db_client.email,
-            "cpf": db_client.cpf,
-            "nome": db_client.nome
-        }
+        "cliente": _cliente_out(db_client)
     }
 
-    return JSONResponse(content=response, status_code=200)
-
+    return ORJSONResponse(content=response, status_code=200)
 
-@router.delete("/{id}")
-def deletar_cliente(id: int, session: Session = Depends(get_session), usuario: str = Depends(verificar_token)):
+@router.delete("/{id}", response_model=ClienteResponse)
+async def deletar_cliente(id: int, session: AsyncSession = Depends(get_session), usuario: str = Depends(usuario_autenticado)):
     """
     Deleta (soft delete) um cliente existente.
 
     Parâmetros:
     - id (int): ID do cliente a ser deletado.
-    - session (Session): Sessão do banco de dados (injeção de dependência).
-    - usuario (str): Nome de usuário injetado automaticamente via Depends(verificar_token).
-        Garante que apenas usuários autenticados possam acessar este endpoint.
+    - session (AsyncSession): Sessão do banco de dados (injeção de dependência).
+    - usuario (str): Nome de usuário injetado automaticamente via Depends(usuario_autenticado).
+        O token já foi validado pelo `verificar_token` aplicado a todo o router.
 
     Retorna:
-    - JSONResponse com status, mensagem e dados do cliente deletado.
+    - ClienteResponse com status, mensagem e dados do cliente deletado.
     - HTTP 404 se o cliente não for encontrado.
     """
-    db_client = session.scalar(
-        select(Client).where(
-            (Client.id == id) & (Client.deleted == False)
-        )
-    )
-
-    if not db_client:
+    db_client = (await session.execute(
+        update(Client)
+        .where((Client.id == id) & (Client.deleted == False))
+        .values(deleted=True)
+        .returning(Client.id, Client.nome, Client.email, Client.cpf),
+        execution_options={"synchronize_session": False}
+    )).first()
+
+    if db_client is None:
         raise HTTPException(
             status_code=404,
             detail="Cliente não encontrado!"
         )
 
-    db_client.deleted = True
-    session.commit()
-    session.refresh(db_client)
+    await session.commit()
 
     response = {
         "status": "success",
         "message": "Cliente deletado com sucesso.",
         "usuario": usuario,
-        "cliente": {
-            "id": db_client.id,
-            "email": db_client.email,
-            "cpf": db_client.cpf,
-            "nome": db_client.nome
-        }
+        "cliente": _cliente_out(db_client)
     }
 
-    return JSONResponse(content=response, status_code=200)
\ No newline at end of file
+    return ORJSONResponse(content=response, status_code=200)
\ No newline at end of file
@@ -1,51 +1,50 @@
-from fastapi import Depends, HTTPException
-from fastapi.responses import JSONResponse
-from fastapi import APIRouter
-from sqlalchemy.orm import Session
-from sqlalchemy import select
-from datetime import timedelta
-from jose import JWTError, jwt
+from fastapi import Depends, HTTPException, APIRouter
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, exists, bindparam
+from jose import JWTError
 
 
 from database import get_session
 from models import User
 from helpers.security import (
     get_senha_hash, verificar_senha,
-    criar_token_acesso,
-    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES, oauth2_scheme)
-from helpers.validacao import verificar_campos_obrigatorios
+    criar_token_acesso, decodificar_token,
+    oauth2_scheme)
+from schemas import LoginIn, RegisterIn
+from helpers.resposta import ORJSONResponse
 
 router = APIRouter()
 
+# O login só precisa do hash da senha; buscar as duas colunas evita montar
+# a entidade inteira a cada tentativa.
+_BUSCAR_USUARIO = select(User.username, User.senha).where(
+    (User.username == bindparam("username")) & (User.deleted == False)
+)
+
+_USUARIO_EXISTENTE = select(exists().where(
+    ((User.username == bindparam("username")) | (User.email == bindparam("email"))) & (User.deleted == False)
+))
+
 
 @router.post("/login")
-def realizar_login(body: dict, session: Session = Depends(get_session)):
+async def realizar_login(body: LoginIn, session: AsyncSession = Depends(get_session)):
     """
     Realiza o login de um usuário.
 
     Parâmetros:
-    - body (dict): Contém 'username' e 'senha'.
-    - session (Session): Sessão do banco de dados.
+    - body (LoginIn): Contém 'username' e 'senha'.
+    - session (AsyncSession): Sessão do banco de dados.
 
     Retorna:
-    - JSONResponse com status e mensagem de sucesso.
-    - HTTP 400 se faltar campos ou a senha estiver incorreta.
+    - ORJSONResponse com status, mensagem de sucesso e o token de acesso.
+    - HTTP 400 se a senha estiver incorreta.
     - HTTP 404 se o usuário não for encontrado.
+    - HTTP 422 se faltar campos obrigatórios.
     """
-    obrigatorios = ["username", "senha"]
-    validacao = verificar_campos_obrigatorios(obrigatorios=obrigatorios, body=body)
-
-    if not validacao:
-        raise HTTPException(
-            status_code=400,
-            detail="Informação obrigatória para login não informada."
-        )
-
-    db_user = session.scalar(
-        select(User).where(
-            (User.username == body["username"]) & (User.deleted == False)
-        )
-    )
+    db_user = (await session.execute(
+        _BUSCAR_USUARIO, {"username": body.username}
+    )).first()
 
     if not db_user:
         raise HTTPException(
@@ -53,7 +52,11 @@ def realizar_login(body: dict, session: Session = Depends(get_session)):
             detail="Usuário com essas informações não encontrado!"
         )
 
-    if not verificar_senha(senha_recebida=body["senha"], hashed_senha=db_user.senha):
+    senha_valida = await run_in_threadpool(
+        verificar_senha, senha_recebida=body.senha, hashed_senha=db_user.senha
+    )
+
+    if not senha_valida:
         raise HTTPException(
             status_code=400,
             detail="Senha inserida está incorreta!"
@@ -70,53 +73,43 @@ def realizar_login(body: dict, session: Session = Depends(get_session)):
         "token_type": "bearer"
     }
 
-    return JSONResponse(content=response, status_code=200)
+    return ORJSONResponse(content=response, status_code=200)
 
 
 @router.post("/register")
-def registrar_usuario(body: dict, session: Session = Depends(get_session)):
+async def registrar_usuario(body: RegisterIn, session: AsyncSession = Depends(get_session)):
     """
     Realiza o cadastro de um novo usuário.
 
     Parâmetros:
-    - body (dict): Contém 'username', 'email' e 'senha'.
-    - session (Session): Sessão do banco de dados.
+    - body (RegisterIn): Contém 'username', 'email' e 'senha'.
+    - session (AsyncSession): Sessão do banco de dados.
 
     Retorna:
-    - JSONResponse com status, mensagem e dados do usuário cadastrado.
-    - HTTP 400 se faltar campos obrigatórios.
+    - ORJSONResponse com status, mensagem e dados do usuário cadastrado.
     - HTTP 409 se o usuário já existir.
+    - HTTP 422 se faltar campos obrigatórios ou algum campo for inválido.
     """
-    obrigatorios = ["username", "email", "senha"]
-    validacao = verificar_campos_obrigatorios(obrigatorios=obrigatorios, body=body)
-
-    if not validacao:
-        raise HTTPException(
-            status_code=400,
-            detail="Informação obrigatória para cadastro não informada."
-        )
-
-    db_user = session.scalar(
-        select(User).where(
-            ((User.username == body["username"]) | (User.email == body["email"])) & (User.deleted == False)
-        )
+    usuario_existente = await session.scalar(
+        _USUARIO_EXISTENTE, {"username": body.username, "email": body.email}
     )
 
-    if db_user:
+    if usuario_existente:
         raise HTTPException(
             status_code=409,
             detail="Usuário com essas informações já cadastrado!"
         )
 
+    senha_hash = await run_in_threadpool(get_senha_hash, body.senha)
+
     db_user = User(
-        username=body["username"],
-        senha=get_senha_hash(body["senha"]),
-        email=body["email"]
+        username=body.username,
+        senha=senha_hash,
+        email=body.email
     )
 
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    await session.commit()
 
     response = {
         "status": "success",
@@ -128,11 +121,11 @@ def registrar_usuario(body: dict, session: Session = Depends(get_session)):
         }
     }
 
-    return JSONResponse(content=response, status_code=200)
+    return ORJSONResponse(content=response, status_code=200)
 
 
 @router.post("/refresh-token")
-def refresh_token(refresh_token: str = Depends(oauth2_scheme)):
+async def refresh_token(refresh_token: str = Depends(oauth2_scheme)):
     """
     Endpoint para gerar um novo access token a partir de um refresh token válido.
     
@@ -140,10 +133,10 @@ def refresh_token(refresh_token: str = Depends(oauth2_scheme)):
         refresh_token (str): Token JWT de refresh.
     
     Returns:
-        dict: Novo token de acesso (access token) e o token de refresh (opcional).
+        ORJSONResponse: Novo token de acesso (access token) e o token de refresh (opcional).
     """
     try:
-        payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decodificar_token(refresh_token)
         username: str = payload.get("sub")
         if username is None:
             raise HTTPException(
@@ -157,13 +150,11 @@ def refresh_token(refresh_token: str = Depends(oauth2_scheme)):
             detail="Refresh token inválido"
         )
 
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = criar_token_acesso(
-        data={"sub": username},
-        expires_delta=access_token_expires
+        data={"sub": username}
     )
 
-    return {
-        "access_token": access_token,
-        "token_type": "bearer"
-    }
\ No newline at end of file
+    return ORJSONResponse(
+        content={"access_token": access_token, "token_type": "bearer"},
+        status_code=200
+    )
\ No newline at end of file
@@ -1,54 +1,123 @@
-from fastapi import Depends, FastAPI, HTTPException, APIRouter, Query
-from fastapi.responses import JSONResponse 
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from fastapi import Depends, HTTPException, APIRouter, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, update, values, column, func, bindparam, Integer
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 
 from database import get_session
 from models import Pedido, ItensPedido, Client, Produto
-from helpers.validacao import verificar_campos_obrigatorios
-from helpers.security import verificar_token
+from schemas import PedidoCreate, PedidoUpdate
+from helpers.security import usuario_autenticado
+from helpers.resposta import ORJSONResponse
 
 
 router = APIRouter()
 
+# A ordenação estável (o id desempata pedidos criados no mesmo instante) mantém
+# as páginas do LIMIT/OFFSET consistentes entre requisições.
+_LISTAR_PEDIDOS = select(
+    Pedido.id, Pedido.cliente_id, Pedido.status, Pedido.preco_total,
+    func.count().over().label("total")
+).where(Pedido.deleted == False).order_by(Pedido.created_at, Pedido.id)
+
+# Semi-join pelos itens: cada pedido aparece uma única vez, mesmo com
+# vários produtos da mesma seção, sem precisar de DISTINCT.
+_PEDIDOS_DA_SECAO = Pedido.id.in_(
+    select(ItensPedido.pedido_id)
+    .join(ItensPedido.produto)
+    .where(Produto.categoria == bindparam("secao"))
+)
+
+_BUSCAR_PEDIDO = select(Pedido).where(
+    (Pedido.id == bindparam("id")) & (Pedido.deleted == False)
+)
+
+_BUSCAR_CLIENTE = select(Client).where(
+    (Client.id == bindparam("id")) & (Client.deleted == False)
+)
+
+# A ordenação por id faz pedidos concorrentes travarem os produtos sempre na
+# mesma sequência, evitando deadlock entre eles. Só as colunas usadas na
+# validação e no total são lidas.
+_TRAVAR_PRODUTOS = select(
+    Produto.id, Produto.preco, Produto.estoque, Produto.disponibilidade
+).where(
+    Produto.id.in_(bindparam("ids", expanding=True)) & (Produto.deleted == False)
+).order_by(Produto.id).with_for_update()
+
+
+def _baixar_estoque(quantidades: dict):
+    # Um único UPDATE ... FROM (VALUES ...) baixa o estoque de todos os produtos do pedido.
+    baixa = values(
+        column("produto_id", Integer), column("quantidade", Integer), name="baixa"
+    ).data(list(quantidades.items()))
+
+    return (
+        update(Produto.__table__)
+        .where(Produto.id == baixa.c.produto_id)
+        .values(estoque=Produto.estoque - baixa.c.quantidade)
+    )
+
+
+def _total_do_pedido(db_produtos: dict, quantidades: dict):
+    # Preço unitário de cada produto vezes a quantidade pedida.
+    return sum(
+        db_produtos[produto_id].preco * quantidade
+        for produto_id, quantidade in quantidades.items()
+    )
+
+
+def _sem_fuso(momento: datetime) -> datetime:
+    # `created_at` é TIMESTAMP sem fuso e o asyncpg recusa datetimes com fuso
+    # nessa coluna; valores com fuso são convertidos para UTC antes do filtro.
+    if momento.tzinfo is None:
+        return momento
+    return momento.astimezone(timezone.utc).replace(tzinfo=None)
+
 
 @router.get("/")
-def listar_pedidos(
+async def listar_pedidos(
     periodo_inicio: Optional[datetime] = Query(None),
     periodo_fim: Optional[datetime] = Query(None),
     secao: Optional[str] = Query(None),
     id_pedido: Optional[int] = Query(None),
     status: Optional[str] = Query(None),
     cliente: Optional[int] = Query(None),
-    session: Session = Depends(get_session),
-    usuario: str = Depends(verificar_token)
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    session: AsyncSession = Depends(get_session),
+    usuario: str = Depends(usuario_autenticado)
 ):
     """
     Lista pedidos com filtros opcionais.
 
     Parâmetros:
     - periodo_inicio (datetime, opcional): Data e hora inicial para filtrar os pedidos.
+        Valores com fuso horário são convertidos para UTC.
     - periodo_fim (datetime, opcional): Data e hora final para filtrar os pedidos.
+        Valores com fuso horário são convertidos para UTC.
     - secao (str, opcional): Filtro pela categoria dos produtos presentes nos pedidos.
     - id_pedido (int, opcional): Filtro pelo ID do pedido.
     - status (str, opcional): Filtro pelo status do pedido.
     - cliente (int, opcional): Filtro pelo ID do cliente.
-    - session (Session): Sessão do banco de dados.
-    - usuario (str): Usuário autenticado via token JWT.
+    - limit (int, padrão=50, máximo=500): Quantidade máxima de pedidos retornados.
+    - offset (int, padrão=0): Ponto de partida para a busca.
+    - session (AsyncSession): Sessão do banco de dados.
+    - usuario (str): Usuário autenticado via token JWT, validado pelo `verificar_token` do router.
 
     Retorna:
-    - JSONResponse contendo a mensagem, total de pedidos e lista dos pedidos filtrados.
+    - ORJSONResponse contendo a mensagem, total de pedidos e lista dos pedidos filtrados.
+        O total considera todos os pedidos que atendem aos filtros, não apenas a página retornada.
     - HTTP 404 se nenhum pedido for encontrado.
     """
-    query = select(Pedido).where(Pedido.deleted == False)
+    query = _LISTAR_PEDIDOS
+    parametros = {}
 
     if periodo_inicio:
-        query = query.where(Pedido.created_at >= periodo_inicio)
+        query = query.where(Pedido.created_at >= _sem_fuso(periodo_inicio))
     if periodo_fim:
-        query = query.where(Pedido.created_at <= periodo_fim)
+        query = query.where(Pedido.created_at <= _sem_fuso(periodo_fim))
     if id_pedido:
         query = query.where(Pedido.id == id_pedido)
     if status:
@@ -56,16 +125,20 @@ def listar_pedidos(
     if cliente:
         query = query.where(Pedido.cliente_id == cliente)
     if secao:
-        query = query.join(Pedido.itens).where(Produto.categoria == secao)
+        query = query.where(_PEDIDOS_DA_SECAO)
+        parametros["secao"] = secao
 
-    pedidos = session.scalars(query).all()
+    query = query.limit(limit).offset(offset)
 
-    if len(pedidos) == 0:
+    pedidos = (await session.execute(query, parametros)).all()
+
+    if not pedidos:
         raise HTTPException(
             status_code=404,
             detail="Pedidos não encontrados com os parâmetros solicitados!"
         )
 
+    total = pedidos[0].total
     pedidos = [
         {
             "id": pedido.id,
@@ -79,36 +152,32 @@ def listar_pedidos(
     data = {
         "mensagem": "Pedidos encontrados com sucesso",
         "usuario": usuario,
-        "total": len(pedidos),
+        "total": total,
         "pedidos": pedidos
     }
 
-    return JSONResponse(content=data, status_code=200)
+    return ORJSONResponse(content=data, status_code=200)
 
 
 @router.get("/{id}")
-def teste_de_get(
+async def teste_de_get(
     id: int, 
-    session: Session = Depends(get_session),
-    usuario: str = Depends(verificar_token)
+    session: AsyncSession = Depends(get_session),
+    usuario: str = Depends(usuario_autenticado)
 ):
     """
     Obtém informações detalhadas de um pedido específico.
 
     Parâmetros:
     - id (int): ID do pedido a ser recuperado.
-    - session (Session): Sessão do banco de dados.
-    - usuario (str): Usuário autenticado via token JWT.
+    - session (AsyncSession): Sessão do banco de dados.
+    - usuario (str): Usuário autenticado via token JWT, validado pelo `verificar_token` do router.
 
     Retorna:
-    - JSONResponse contendo a mensagem e os detalhes do pedido.
+    - ORJSONResponse contendo a mensagem e os detalhes do pedido.
     - HTTP 404 se o pedido não for encontrado.
     """
-    db_pedido = session.scalar(
-        select(Pedido).where(
-            (Pedido.id == id) & (Pedido.deleted == False)
-        )
-    )
+    db_pedido = await session.scalar(_BUSCAR_PEDIDO, {"id": id})
 
     if not db_pedido:
         raise HTTPException(
@@ -126,14 +195,14 @@ def teste_de_get(
         }
     }
 
-    return JSONResponse(content=data, status_code=200)
+    return ORJSONResponse(content=data, status_code=200)
 
 
 @router.post("/")
-def criar_pedido(
-    body: dict, 
-    session: Session = Depends(get_session),
-    usuario: str = Depends(verificar_token)
+async def criar_pedido(
+    body: PedidoCreate, 
+    session: AsyncSession = Depends(get_session),
+    usuario: str = Depends(usuario_autenticado)
 ):
     """
     Cria um novo pedido contendo múltiplos produtos.
@@ -141,27 +210,17 @@ def criar_pedido(
     Valida a existência do cliente, a disponibilidade de estoque e o status de cada produto antes de criar o pedido.
 
     Parâmetros:
-    - body (dict): Dados do pedido, contendo o `cliente_id` e a lista de `produtos` com `produto_id` e `quantidade`.
-    - session (Session): Sessão do banco de dados.
-    - usuario (str): Usuário autenticado via token JWT.
+    - body (PedidoCreate): Dados do pedido, contendo o `cliente_id` e a lista de `produtos` com `produto_id` e `quantidade`.
+    - session (AsyncSession): Sessão do banco de dados.
+    - usuario (str): Usuário autenticado via token JWT, validado pelo `verificar_token` do router.
 
     Retorna:
-    - JSONResponse com mensagem de sucesso, ID do pedido criado, total do pedido e lista de produtos.
-    - HTTP 400 ou 404 em caso de erros de validação.
+    - ORJSONResponse com mensagem de sucesso, ID do pedido criado, total do pedido e lista de produtos.
+    - HTTP 404 se o cliente ou algum produto não for encontrado, ou não houver estoque.
+    - HTTP 422 se faltar campos obrigatórios, a lista de produtos estiver vazia
+        ou alguma quantidade não for positiva.
     """
-    obrigatorios = ["cliente_id", "produtos"]
-
-    if not verificar_campos_obrigatorios(obrigatorios=obrigatorios, body=body):
-        raise HTTPException(
-            status_code=400,
-            detail="Informação obrigatória para cadastro não informada",
-        )
-
-    db_client = session.scalar(
-        select(Client).where(
-            (Client.id == body["cliente_id"]) & (Client.deleted == False)
-        )
-    )
+    db_client = await session.scalar(_BUSCAR_CLIENTE, {"id": body.cliente_id})
 
     if not db_client:
         raise HTTPException(
@@ -169,30 +228,28 @@ def criar_pedido(
             detail="Cliente não encontrado!"
         )
 
-    if len(body["produtos"]) == 0:
-        raise HTTPException(
-            status_code=404,
-            detail="Não é possível criar pedido sem os produtos",
-        )
-
-    total = 0
-    ids_itens = []
+    quantidades = {}
     produtos_list = []
 
-    for produto in body["produtos"]:
-        obrigatorios = ["produto_id", "quantidade"]
-
-        if not verificar_campos_obrigatorios(obrigatorios=obrigatorios, body=produto):
-            raise HTTPException(
-                status_code=404,
-                detail="Informação obrigatória para cadastro de produto não informada",
-            )
+    for produto in body.produtos:
+        quantidades[produto.produto_id] = (
+            quantidades.get(produto.produto_id, 0) + produto.quantidade
+        )
+        produtos_list.append(
+            {'produto_id': produto.produto_id, 'quantidade': produto.quantidade}
+        )
 
-        db_produto = session.scalar(
-            select(Produto).where(
-                (Produto.id == produto["produto_id"]) & (Produto.deleted == False)
-            )
+    # Um único SELECT ... FOR UPDATE para todos os produtos do pedido; o
+    # estoque fica travado até o commit, então a validação abaixo vale até a baixa.
+    db_produtos = {
+        db_produto.id: db_produto
+        for db_produto in await session.execute(
+            _TRAVAR_PRODUTOS, {"ids": list(quantidades)}
         )
+    }
+
+    for produto_id, quantidade in quantidades.items():
+        db_produto = db_produtos.get(produto_id)
 
         if not db_produto:
             raise HTTPException(
@@ -204,44 +261,33 @@ def criar_pedido(
                 status_code=404,
                 detail="Produto indisponível!"
             )
-        elif db_produto.estoque < produto["quantidade"]:
+        elif db_produto.estoque < quantidade:
             raise HTTPException(
                 status_code=404,
                 detail="Quantidade não disponível!"
             )
 
-        db_produto.estoque -= produto["quantidade"]
-        total += db_produto.preco
-
-        db_item_produto = ItensPedido(
-            pedido_id=None,
-            produto_id=produto['produto_id'],
-            quantidade=produto['quantidade'],
-            preco=db_produto.preco,
-        )
-        session.add(db_item_produto)
-        session.commit()
-        session.refresh(db_item_produto)
+    # O total sai dos preços já travados acima, sem uma nova consulta aos itens.
+    total = _total_do_pedido(db_produtos, quantidades)
 
-        ids_itens.append(db_item_produto.id)
-        produtos_list.append(
-            {'produto_id': produto['produto_id'], 'quantidade': produto['quantidade']}
-        )
-
-    db_pedido = Pedido(cliente_id=body["cliente_id"], status="PENDENTE", preco_total=total)
+    db_pedido = Pedido(cliente_id=body.cliente_id, status="PENDENTE", preco_total=total)
     session.add(db_pedido)
-    session.commit()
-    session.refresh(db_pedido)
-
-    for id in ids_itens:
-        db_item = session.scalar(
-            select(ItensPedido).where(
-                (ItensPedido.id == id) & (Produto.deleted == False)
-            )
-        )
-        db_item.pedido_id = db_pedido.id
-        session.commit()
-        session.refresh(db_item_produto)
+    await session.flush()
+
+    await session.execute(
+        insert(ItensPedido),
+        [
+            {
+                "pedido_id": db_pedido.id,
+                "produto_id": produto["produto_id"],
+                "quantidade": produto["quantidade"],
+                "preco": db_produtos[produto["produto_id"]].preco,
+            }
+            for produto in produtos_list
+        ]
+    )
+    await session.execute(_baixar_estoque(quantidades))
+    await session.commit()
 
     data = {
         "mensagem": "Pedido cadastrado com sucesso",
@@ -251,36 +297,49 @@ def criar_pedido(
         "produtos": produtos_list
     }
 
-    return JSONResponse(content=data, status_code=200)
+    return ORJSONResponse(content=data, status_code=200)
 
 
 @router.put("/{id}")
-def atualizar_pedido(
+async def atualizar_pedido(
     id: int, 
-    body: dict, 
-    session: Session = Depends(get_session),
-    usuario: str = Depends(verificar_token)
+    body: PedidoUpdate, 
+    session: AsyncSession = Depends(get_session),
+    usuario: str = Depends(usuario_autenticado)
 ):
     """
     Atualiza informações de um pedido específico.
 
-    Permite modificar qualquer campo existente no modelo `Pedido` com base nos dados enviados no `body`.
+    Permite modificar o cliente e o status do pedido com base nos dados enviados no `body`.
+    O preço total é calculado a partir dos itens na criação do pedido e não pode ser alterado.
 
     Parâmetros:
     - id (int): ID do pedido a ser atualizado.
-    - body (dict): Dados a serem atualizados no pedido.
-    - session (Session): Sessão do banco de dados.
-    - usuario (str): Usuário autenticado via token JWT.
+    - body (PedidoUpdate): Dados a serem atualizados no pedido.
+    - session (AsyncSession): Sessão do banco de dados.
+    - usuario (str): Usuário autenticado via token JWT, validado pelo `verificar_token` do router.
 
     Retorna:
-    - JSONResponse com mensagem de sucesso e detalhes do pedido atualizado.
-    - HTTP 404 se o pedido não for encontrado.
+    - ORJSONResponse com mensagem de sucesso e detalhes do pedido atualizado.
+    - HTTP 404 se o pedido ou o novo cliente não for encontrado.
+    - HTTP 422 se algum campo for inválido.
     """
-    db_pedido = session.scalar(
-        select(Pedido).where(
-            (Pedido.id == id) & (Pedido.deleted == False)
-        )
-    )
+    if body.cliente_id is not None:
+        db_client = await session.scalar(_BUSCAR_CLIENTE, {"id": body.cliente_id})
+
+        if not db_client:
+            raise HTTPException(
+                status_code=404,
+                detail="Cliente não encontrado!"
+            )
+
+    db_pedido = (await session.execute(
+        update(Pedido)
+        .where((Pedido.id == id) & (Pedido.deleted == False))
+        .values(**body.model_dump(exclude_none=True))
+        .returning(Pedido.cliente_id, Pedido.status, Pedido.preco_total),
+        execution_options={"synchronize_session": False}
+    )).first()
 
     if not db_pedido:
         raise HTTPException(
@@ -288,13 +347,7 @@ def atualizar_pedido(
             detail="Pedido não encontrado!"
         )
 
-    for chave in body.keys():
-        if not hasattr(db_pedido, chave):
-            continue
-        setattr(db_pedido, chave, body[chave])
-
-    session.commit()
-    session.refresh(db_pedido)
+    await session.commit()
 
     data = {
         "mensagem": "Pedido alterado com sucesso",
@@ -306,14 +359,14 @@ def atualizar_pedido(
         }
     }
 
-    return JSONResponse(content=data, status_code=200)
+    return ORJSONResponse(content=data, status_code=200)
 
 
 @router.delete("/{id}")
-def deletar_pedido(
+async def deletar_pedido(
     id: int, 
-    session: Session = Depends(get_session),
-    usuario: str = Depends(verificar_token)
+    session: AsyncSession = Depends(get_session),
+    usuario: str = Depends(usuario_autenticado)
 ):
     """
     Exclui (soft delete) um pedido específico.
@@ -322,18 +375,20 @@ def deletar_pedido(
 
     Parâmetros:
     - id (int): ID do pedido a ser excluído.
-    - session (Session): Sessão do banco de dados.
-    - usuario (str): Usuário autenticado via token JWT.
+    - session (AsyncSession): Sessão do banco de dados.
+    - usuario (str): Usuário autenticado via token JWT, validado pelo `verificar_token` do router.
 
     Retorna:
-    - JSONResponse com mensagem de sucesso e detalhes do pedido excluído.
+    - ORJSONResponse com mensagem de sucesso e detalhes do pedido excluído.
     - HTTP 404 se o pedido não for encontrado.
     """
-    db_pedido = session.scalar(
-        select(Pedido).where(
-            (Pedido.id == id) & (Pedido.deleted == False)
-        )
-    )
+    db_pedido = (await session.execute(
+        update(Pedido)
+        .where((Pedido.id == id) & (Pedido.deleted == False))
+        .values(deleted=True)
+        .returning(Pedido.cliente_id, Pedido.status, Pedido.preco_total),
+        execution_options={"synchronize_session": False}
+    )).first()
 
     if not db_pedido:
         raise HTTPException(
@@ -341,9 +396,7 @@ def deletar_pedido(
             detail="Pedido não encontrado!"
         )
 
-    db_pedido.deleted = True
-    session.commit()
-    session.refresh(db_pedido)
+    await session.commit()
 
     data = {
         "mensagem": "Pedido deletado com sucesso",
@@ -355,4 +408,4 @@ def deletar_pedido(
         }
     }
 
-    return JSONResponse(content=data, status_code=200)
+    return ORJSONResponse(content=data, status_code=200)
@@ -1,46 +1,70 @@
-from fastapi import Depends, FastAPI, HTTPException, APIRouter, Query
-from fastapi.responses import JSONResponse 
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from fastapi import Depends, HTTPException, APIRouter, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, exists, func, bindparam
 from typing import Optional
+from decimal import Decimal
 
 from database import get_session
 from models import Produto
-from helpers.validacao import verificar_campos_obrigatorios
-from helpers.security import verificar_token
+from schemas import ProdutoCreate, ProdutoUpdate
+from helpers.security import usuario_autenticado
+from helpers.resposta import ORJSONResponse
 
 router = APIRouter()
 
+_COLUNAS_PRODUTO = (
+    Produto.id, Produto.descricao, Produto.codigo_barras, Produto.estoque,
+    Produto.data_validade, Produto.imagens, Produto.preco, Produto.categoria,
+    Produto.disponibilidade
+)
+
+_LISTAR_PRODUTOS = select(
+    *_COLUNAS_PRODUTO, func.count().over().label("total")
+).where(Produto.deleted == False)
+
+_BUSCAR_PRODUTO = select(Produto).where(
+    (Produto.id == bindparam("id")) & (Produto.deleted == False)
+)
+
+_MESMO_CODIGO_BARRAS = (Produto.codigo_barras == bindparam("codigo_barras")) & (Produto.deleted == False)
+
+_PRODUTO_EXISTENTE = select(exists().where(_MESMO_CODIGO_BARRAS))
+
+_CODIGO_BARRAS_EM_USO = select(exists().where(
+    _MESMO_CODIGO_BARRAS & (Produto.id != bindparam("id"))
+))
+
 
 @router.get("/")
-def listar_produtos(
+async def listar_produtos(
     categoria: Optional[str] = Query(None),
-    preco: Optional[str] = Query(None),
+    preco: Optional[Decimal] = Query(None),
     disponibilidade: Optional[bool] = Query(None),
     limit: int = Query(10, ge=1),
     offset: int = Query(0, ge=0),
-    session: Session = Depends(get_session),
-    usuario: str = Depends(verificar_token)
+    session: AsyncSession = Depends(get_session),
+    usuario: str = Depends(usuario_autenticado)
     ):
     """
     Lista produtos com filtros opcionais.
 
     Parâmetros:
     - categoria (str, opcional): Categoria do produto.
-    - preco (str, opcional): Preço exato.
+    - preco (Decimal, opcional): Preço exato.
     - disponibilidade (bool, opcional): Disponibilidade do produto.
     - limit (int): Quantidade máxima de resultados.
     - offset (int): Deslocamento inicial.
-    - session (Session): Sessão do banco de dados.
-    - usuario (str): Nome de usuário injetado automaticamente via Depends(verificar_token).
-        Garante que apenas usuários autenticados possam acessar este endpoint.
+    - session (AsyncSession): Sessão do banco de dados.
+    - usuario (str): Nome de usuário injetado automaticamente via Depends(usuario_autenticado).
+        O token já foi validado pelo `verificar_token` aplicado a todo o router.
 
     Retorna:
-    - JSONResponse com lista de produtos e metadados.
+    - ORJSONResponse com lista de produtos e metadados.
+        O total considera todos os produtos que atendem aos filtros, não apenas a página retornada.
     - HTTP 404 se nenhum produto for encontrado.
     """
     
-    query = select(Produto).where(Produto.deleted == False)
+    query = _LISTAR_PRODUTOS
 
     if categoria:
         query = query.where(Produto.categoria.ilike(f"%{categoria}%"))
@@ -53,7 +77,7 @@ def listar_produtos(
 
     query = query.limit(limit).offset(offset)
 
-    db_produtos = session.scalars(query).all()
+    db_produtos = (await session.execute(query)).all()
 
     if not db_produtos:
         raise HTTPException(
@@ -67,7 +91,7 @@ def listar_produtos(
             "descricao": produto.descricao,
             "codigo_barras": produto.codigo_barras,
             "estoque": produto.estoque,
-            "data_validade": str(produto.data_validade),
+            "data_validade": produto.data_validade,
             "imagens": produto.imagens,
             "preco": produto.preco,
             "categoria": produto.categoria,
@@ -80,34 +104,30 @@ def listar_produtos(
         "status": "success",
         "message": "Produtos encontrados com sucesso.",
         "usuario": usuario,
-        "total": len(produtos),
+        "total": db_produtos[0].total,
         "produtos": produtos
     }
 
-    return JSONResponse(content=response, status_code=200)
+    return ORJSONResponse(content=response, status_code=200)
 
 
 @router.get("/{id}")
-def buscar_produto_por_id(id: int, session: Session = Depends(get_session), usuario: str = Depends(verificar_token)):
+async def buscar_produto_por_id(id: int, session: AsyncSession = Depends(get_session), usuario: str = Depends(usuario_autenticado)):
     """
     Busca um produto pelo ID.
 
     Parâmetros:
     - id (int): ID do produto.
-    - session (Session): Sessão do banco de dados.
-    - usuario (str): Nome de usuário injetado automaticamente via Depends(verificar_token).
-        Garante que apenas usuários autenticados possam acessar este endpoint.
+    - session (AsyncSession): Sessão do banco de dados.
+    - usuario (str): Nome de usuário injetado automaticamente via Depends(usuario_autenticado).
+        O token já foi validado pelo `verificar_token` aplicado a todo o router.
 
     Retorna:
-    - JSONResponse com os dados do produto.
+    - ORJSONResponse com os dados do produto.
     - HTTP 404 se o produto não for encontrado.
     """
     
-    db_produto = session.scalar(
-        select(Produto).where(
-            (Produto.id == id) & (Produto.deleted == False)
-        )
-    )
+    db_produto = await session.scalar(_BUSCAR_PRODUTO, {"id": id})
 
     if not db_produto:
         raise HTTPException(
@@ -124,7 +144,7 @@ def buscar_produto_por_id(id: int, session: Session = Depends(get_session), usua
             "descricao": db_produto.descricao,
             "codigo_barras": db_produto.codigo_barras,
             "estoque": db_produto.estoque,
-            "data_validade": str(db_produto.data_validade),
+            "data_validade": db_produto.data_validade,
             "imagens": db_produto.imagens,
             "preco": db_produto.preco,
             "categoria": db_produto.categoria,
@@ -132,57 +152,38 @@ def buscar_produto_por_id(id: int, session: Session = Depends(get_session), usua
         }
     }
 
-    return JSONResponse(content=response, status_code=200)
+    return ORJSONResponse(content=response, status_code=200)
 
 
 @router.post("/")
-def criar_produto(body: dict, session: Session = Depends(get_session), usuario: str = Depends(verificar_token)):
+async def criar_produto(body: ProdutoCreate, session: AsyncSession = Depends(get_session), usuario: str = Depends(usuario_autenticado)):
     """
     Cria um novo produto.
 
     Parâmetros:
-    - body (dict): Dados do produto.
-    - session (Session): Sessão do banco de dados.
-    - usuario (str): Nome de usuário injetado automaticamente via Depends(verificar_token).
-        Garante que apenas usuários autenticados possam acessar este endpoint.
+    - body (ProdutoCreate): Dados do produto.
+    - session (AsyncSession): Sessão do banco de dados.
+    - usuario (str): Nome de usuário injetado automaticamente via Depends(usuario_autenticado).
+        O token já foi validado pelo `verificar_token` aplicado a todo o router.
 
     Retorna:
-    - JSONResponse com dados do produto criado.
-    - HTTP 400 se faltar campos obrigatórios.
+    - ORJSONResponse com dados do produto criado.
     - HTTP 409 se produto já existir.
+    - HTTP 422 se faltar campos obrigatórios ou algum campo for inválido.
     """
-    obrigatorios = ["descricao", "codigo_barras", "estoque", "data_validade", "preco", "categoria"]
-    validacao = verificar_campos_obrigatorios(obrigatorios=obrigatorios, body=body)
-    if not validacao:
-        raise HTTPException(
-            status_code=400,
-            detail="Informação obrigatória para cadastro não informada."
-        )
-
-    db_produto = session.scalar(
-        select(Produto).where(
-            (Produto.codigo_barras == body["codigo_barras"]) & (Produto.deleted == False)
-        )
+    produto_existente = await session.scalar(
+        _PRODUTO_EXISTENTE, {"codigo_barras": body.codigo_barras}
     )
-    if db_produto:
+    if produto_existente:
         raise HTTPException(
             status_code=409,
             detail="Produto com essas informações já cadastrado!"
         )
 
-    db_produto = Produto(
-        descricao=body["descricao"],
-        codigo_barras=body["codigo_barras"],
-        estoque=body["estoque"],
-        data_validade=body["data_validade"],
-        imagens=body.get("imagens", []),
-        preco=body["preco"],
-        categoria=body["categoria"]
-    )
+    db_produto = Produto(**body.model_dump())
 
     session.add(db_produto)
-    session.commit()
-    session.refresh(db_produto)
+    await session.commit()
 
     response = {
         "status": "success",
@@ -193,7 +194,7 @@ def criar_produto(body: dict, session: Session = Depends(get_session), usuario:
             "descricao": db_produto.descricao,
             "codigo_barras": db_produto.codigo_barras,
             "estoque": db_produto.estoque,
-            "data_validade": str(db_produto.data_validade),
+            "data_validade": db_produto.data_validade,
             "imagens": db_produto.imagens,
             "preco": db_produto.preco,
             "categoria": db_produto.categoria,
@@ -201,57 +202,54 @@ def criar_produto(body: dict, session: Session = Depends(get_session), usuario:
         }
     }
 
-    return JSONResponse(content=response, status_code=201)
+    return ORJSONResponse(content=response, status_code=201)
 
 
 @router.put("/{id}")
-def atualizar_produto(id: int, body: dict, session: Session = Depends(get_session), usuario: str = Depends(verificar_token)):
+async def atualizar_produto(id: int, body: ProdutoUpdate, session: AsyncSession = Depends(get_session), usuario: str = Depends(usuario_autenticado)):
     """
     Atualiza um produto existente.
 
     Parâmetros:
     - id (int): ID do produto.
-    - body (dict): Dados para atualização.
-    - session (Session): Sessão do banco de dados.
-    - usuario (str): Nome de usuário injetado automaticamente via Depends(verificar_token).
-        Garante que apenas usuários autenticados possam acessar este endpoint.
+    - body (ProdutoUpdate): Dados para atualização.
+    - session (AsyncSession): Sessão do banco de dados.
+    - usuario (str): Nome de usuário injetado automaticamente via Depends(usuario_autenticado).
+        O token já foi validado pelo `verificar_token` aplicado a todo o router.
 
     Retorna:
-    - JSONResponse com dados do produto atualizado.
+    - ORJSONResponse com dados do produto atualizado.
     - HTTP 404 se produto não for encontrado.
     - HTTP 409 se houver conflito de dados únicos.
+    - HTTP 422 se algum campo for inválido.
     """
-    db_produto = session.scalar(
-        select(Produto).where(
-            (Produto.id == id) & (Produto.deleted == False)
-        )
-    )
+    dados = body.model_dump(exclude_none=True)
 
-    if not db_produto:
-        raise HTTPException(
-            status_code=404,
-            detail="Produto não encontrado!"
+    if "codigo_barras" in dados:
+        codigo_em_uso = await session.scalar(
+            _CODIGO_BARRAS_EM_USO, {"codigo_barras": dados["codigo_barras"], "id": id}
         )
-
-    if "codigo_barras" in body:
-        db_produto_validacao = session.scalar(
-            select(Produto).where(
-                (Produto.codigo_barras == body["codigo_barras"]) & (Produto.deleted == False) & (Produto.id != id)
-            )
-        )
-        if db_produto_validacao:
+        if codigo_em_uso:
             raise HTTPException(
                 status_code=409,
                 detail="Já existe algum produto cadastrado com esta informação única!"
             )
 
-    for chave, valor in body.items():
-        if not hasattr(db_produto, chave):
-            continue
-        setattr(db_produto, chave, valor)
+    db_produto = (await session.execute(
+        update(Produto)
+        .where((Produto.id == id) & (Produto.deleted == False))
+        .values(**dados)
+        .returning(*_COLUNAS_PRODUTO),
+        execution_options={"synchronize_session": False}
+    )).first()
 
-    session.commit()
-    session.refresh(db_produto)
+    if not db_produto:
+        raise HTTPException(
+            status_code=404,
+            detail="Produto não encontrado!"
+        )
+
+    await session.commit()
 
     response = {
         "status": "success",
@@ -262,7 +260,7 @@ def atualizar_produto(id: int, body: dict, session: Session = Depends(get_sessio
             "descricao": db_produto.descricao,
             "codigo_barras": db_produto.codigo_barras,
             "estoque": db_produto.estoque,
-            "data_validade": str(db_produto.data_validade),
+            "data_validade": db_produto.data_validade,
             "imagens": db_produto.imagens,
             "preco": db_produto.preco,
             "categoria": db_produto.categoria,
@@ -270,29 +268,33 @@ def atualizar_produto(id: int, body: dict, session: Session = Depends(get_sessio
         }
     }
 
-    return JSONResponse(content=response, status_code=200)
+    return ORJSONResponse(content=response, status_code=200)
 
 
 @router.delete("/{id}")
-def deletar_produto(id: int, session: Session = Depends(get_session), usuario: str = Depends(verificar_token)):
+async def deletar_produto(id: int, session: AsyncSession = Depends(get_session), usuario: str = Depends(usuario_autenticado)):
     """
     Deleta (soft delete) um produto pelo ID.
 
     Parâmetros:
     - id (int): ID do produto.
-    - session (Session): Sessão do banco de dados.
-    - usuario (str): Nome de usuário injetado automaticamente via Depends(verificar_token).
-        Garante que apenas usuários autenticados possam acessar este endpoint.
+    - session (AsyncSession): Sessão do banco de dados.
+    - usuario (str): Nome de usuário injetado automaticamente via Depends(usuario_autenticado).
+        O token já foi validado pelo `verificar_token` aplicado a todo o router.
 
     Retorna:
-    - JSONResponse com dados do produto deletado.
+    - ORJSONResponse com dados do produto deletado.
     - HTTP 404 se produto não for encontrado.
     """
-    db_produto = session.scalar(
-        select(Produto).where(
-            (Produto.id == id) & (Produto.deleted == False)
-        )
-    )
+    # UPDATE ... RETURNING: a `disponibilidade` é gerada pelo banco e seria
+    # expirada pelo flush de uma entidade alterada, exigindo uma nova consulta.
+    db_produto = (await session.execute(
+        update(Produto)
+        .where((Produto.id == id) & (Produto.deleted == False))
+        .values(deleted=True)
+        .returning(*_COLUNAS_PRODUTO),
+        execution_options={"synchronize_session": False}
+    )).first()
 
     if not db_produto:
         raise HTTPException(
@@ -300,9 +302,7 @@ def deletar_produto(id: int, session: Session = Depends(get_session), usuario: s
             detail="Produto não encontrado!"
         )
 
-    db_produto.deleted = True
-    session.commit()
-    session.refresh(db_produto)
+    await session.commit()
 
     response = {
         "status": "success",
@@ -313,7 +313,7 @@ def deletar_produto(id: int, session: Session = Depends(get_session), usuario: s
             "descricao": db_produto.descricao,
             "codigo_barras": db_produto.codigo_barras,
             "estoque": db_produto.estoque,
-            "data_validade": str(db_produto.data_validade),
+            "data_validade": db_produto.data_validade,
             "imagens": db_produto.imagens,
             "preco": db_produto.preco,
             "categoria": db_produto.categoria,
@@ -321,4 +321,4 @@ def deletar_produto(id: int, session: Session = Depends(get_session), usuario: s
         }
     }
 
-    return JSONResponse(content=response, status_code=200)
\ No newline at end of file
+    return ORJSONResponse(content=response, status_code=200)
\ No newline at end of file
@@ -0,0 +1,22 @@
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+from decimal import Decimal
+from typing import Any
+import orjson
+
+
+def _padrao_json(valor):
+    if isinstance(valor, Decimal):
+        return str(valor)
+    raise TypeError
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """
+    `ORJSONResponse` que também serializa os valores `Decimal` das colunas monetárias.
+
+    Os valores são enviados como texto (por exemplo `"10.30"`), preservando as duas
+    casas decimais exatas das colunas `Numeric(12, 2)` sem arredondamento de `float`.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_padrao_json)
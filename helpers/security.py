@@ -1,19 +1,36 @@
 from passlib.context import CryptContext
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 from fastapi.security import OAuth2PasswordBearer
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
+from cachetools import TTLCache
+from threading import Lock
+import hashlib
 import os
+import time
 from dotenv import load_dotenv
 
+load_dotenv()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Custo do bcrypt configurável; hashes gerados com outro custo continuam válidos,
+# já que o número de rounds fica gravado no próprio hash.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "10"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=BCRYPT_ROUNDS, deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
+_tokens_decodificados = TTLCache(maxsize=4096, ttl=30)
+_tokens_decodificados_lock = Lock()
+
 
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+# Configuração lida uma única vez na importação; a ausência de SECRET_KEY ou
+# ALGORITHM interrompe a inicialização com KeyError.
+SECRET_KEY = os.environ["SECRET_KEY"]
+ALGORITHM = os.environ["ALGORITHM"]
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+
+_ALGS = [ALGORITHM]
+_DEFAULT_EXP = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
 
 def get_senha_hash(senha: str):
@@ -76,23 +93,60 @@ def criar_token_acesso(data: dict, expires_delta: timedelta = None):
     :rtype: str
     """
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.now(timezone.utc) + (expires_delta or _DEFAULT_EXP)
     
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verificar_token(token: str = Depends(oauth2_scheme)):
+def decodificar_token(token: str):
+    """
+    Decodifica e valida um token JWT, reaproveitando resultados recentes.
+
+    A verificação da assinatura é feita apenas na primeira vez que o token é visto;
+    o payload fica em um cache de curta duração (30 segundos) indexado pelo hash do
+    token. Um payload em cache só é devolvido enquanto o `exp` do token não passou.
+
+    :param token: 
+        O token JWT recebido na requisição.
+    
+    :return: 
+        O payload decodificado do token.
+    
+    :rtype: dict
+
+    :raises JWTError: 
+        Se o token for inválido ou estiver expirado.
+    """
+    chave = hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    with _tokens_decodificados_lock:
+        payload = _tokens_decodificados.get(chave)
+
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=_ALGS)
+
+    with _tokens_decodificados_lock:
+        _tokens_decodificados[chave] = payload
+
+    return payload
+
+
+async def verificar_token(request: Request, token: str = Depends(oauth2_scheme)):
     """
     Valida o token JWT de autenticação.
 
-    Esta função decodifica o token JWT utilizando a chave secreta e o algoritmo especificado. 
-    Se o token for válido, retorna o `username` extraído do campo `sub` do payload.
+    Esta função decodifica o token JWT via `decodificar_token`, que evita repetir a 
+    verificação da assinatura para tokens vistos nos últimos segundos. 
+    Se o token for válido, guarda o `username` extraído do campo `sub` do payload em
+    `request.state.usuario` e o retorna.
     Caso o token seja inválido ou o `username` não seja encontrado, levanta uma exceção HTTP 401.
 
+    :param request: 
+        A requisição atual, onde o usuário autenticado fica disponível para os endpoints.
+
     :param token: 
         O token JWT enviado na requisição, obtido automaticamente através do `Depends` com o `oauth2_scheme`.
     
@@ -105,16 +159,36 @@ def verificar_token(token: str = Depends(oauth2_scheme)):
         Se o token for inválido ou não contiver o campo `sub`.
     """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decodificar_token(token)
         username: str = payload.get("sub")
         if not username:
             raise HTTPException(
             status_code=401,
             detail="Token inválido."
         )
+        request.state.usuario = username
         return username
     except JWTError:
         raise HTTPException(
             status_code=401,
             detail="Token inválido"
-        )
\ No newline at end of file
+        )
+
+async def usuario_autenticado(request: Request):
+    """
+    Retorna o usuário autenticado da requisição atual.
+
+    Lê o `username` guardado em `request.state.usuario` pelo `verificar_token`, que roda
+    como dependência de todo o router; o token não é decodificado novamente.
+    As duas dependências são `async` para rodarem no event loop, sem ocupar o
+    threadpool usado pelo bcrypt no login e no cadastro.
+
+    :param request: 
+        A requisição atual.
+    
+    :return: 
+        O `username` do usuário autenticado.
+    
+    :rtype: str
+    """
+    return request.state.usuario
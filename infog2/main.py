@@ -1,12 +1,23 @@
-from fastapi import FastAPI 
+from fastapi import FastAPI, Depends
+from fastapi.middleware.gzip import GZipMiddleware
 from apps.infog2 import auth
 from apps.clients import clients
 from apps.produtos import produtos
 from apps.pedidos import pedidos
+from helpers.security import verificar_token
+from helpers.resposta import ORJSONResponse
 
-app = FastAPI()  
+app = FastAPI(default_response_class=ORJSONResponse)
+app.add_middleware(GZipMiddleware, minimum_size=500)
 
-app.include_router(auth.router, prefix="/auth", tags=["auth"])
-app.include_router(clients.router, prefix="/clients", tags=["clients"])
-app.include_router(produtos.router, prefix="/produtos", tags=["produtos"])
-app.include_router(pedidos.router, prefix="/pedidos", tags=["pedidos"])
\ No newline at end of file
+AUTH_DEP = [Depends(verificar_token)]
+
+ROUTERS = [
+    (auth.router, "/auth", "auth", []),
+    (clients.router, "/clients", "clients", AUTH_DEP),
+    (produtos.router, "/produtos", "produtos", AUTH_DEP),
+    (pedidos.router, "/pedidos", "pedidos", AUTH_DEP),
+]
+
+for router, prefix, tag, dependencies in ROUTERS:
+    app.include_router(router, prefix=prefix, tags=[tag], dependencies=dependencies)
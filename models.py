@@ -1,6 +1,8 @@
 from datetime import datetime, date
+from decimal import Decimal
 
-from sqlalchemy import func, Boolean, JSON, String, ForeignKey
+from sqlalchemy import func, text, Boolean, Computed, Numeric, String, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, registry, relationship
 
 
@@ -10,11 +12,15 @@ table_registry = registry()
 @table_registry.mapped_as_dataclass
 class User:
     __tablename__ = 'users'
+    __table_args__ = (
+        Index("ix_users_username_live", "username", unique=True, postgresql_where=text("deleted = false")),
+        Index("ix_users_email_live", "email", unique=True, postgresql_where=text("deleted = false")),
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
-    username: Mapped[str] = mapped_column(unique=True)
+    username: Mapped[str]
     senha: Mapped[str]
-    email: Mapped[str] = mapped_column(unique=True)
+    email: Mapped[str]
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
     )
@@ -31,10 +37,14 @@ class User:
 @table_registry.mapped_as_dataclass
 class Client:
     __tablename__ = 'clients'
+    __table_args__ = (
+        Index("ix_clients_cpf_live", "cpf", unique=True, postgresql_where=text("deleted = false")),
+        Index("ix_clients_email_live", "email", unique=True, postgresql_where=text("deleted = false")),
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
-    email: Mapped[str] = mapped_column(unique=True)
-    cpf: Mapped[str] = mapped_column(unique=True)
+    email: Mapped[str]
+    cpf: Mapped[str]
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
     )
@@ -47,17 +57,42 @@ class Client:
     nome: Mapped[str] = mapped_column(unique=False, default=None)
 
 
+Index(
+    "ix_clients_nome_trgm",
+    func.lower(Client.nome).label("nome_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"nome_lower": "gin_trgm_ops"},
+)
+Index(
+    "ix_clients_email_trgm",
+    func.lower(Client.email).label("email_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"email_lower": "gin_trgm_ops"},
+)
+
+
 @table_registry.mapped_as_dataclass
 class Produto:
     __tablename__ = 'produtos'
+    __table_args__ = (
+        Index(
+            "ix_produtos_categoria_trgm", "categoria",
+            postgresql_using="gin", postgresql_ops={"categoria": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_produtos_categoria_disponibilidade_live", "categoria", "disponibilidade",
+            postgresql_where=text("deleted = false"),
+        ),
+        Index("ix_produtos_codigo_barras_live", "codigo_barras", unique=True, postgresql_where=text("deleted = false")),
+    )
     
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     descricao: Mapped[str] = mapped_column()
-    codigo_barras: Mapped[str] = mapped_column(unique=True)
+    codigo_barras: Mapped[str] = mapped_column()
     estoque: Mapped[int] = mapped_column()
     data_validade: Mapped[date] = mapped_column(nullable=True)
-    imagens: Mapped[list] = mapped_column(JSON, nullable=True)
-    preco: Mapped[float] = mapped_column()
+    imagens: Mapped[list] = mapped_column(JSONB, nullable=True)
+    preco: Mapped[Decimal] = mapped_column(Numeric(12, 2))
     categoria: Mapped[str] = mapped_column()    
 
     created_at: Mapped[datetime] = mapped_column(
@@ -70,7 +105,7 @@ class Produto:
         Boolean, default=False, server_default='false'
     )
     disponibilidade: Mapped[bool] = mapped_column(
-        Boolean, default=True, server_default='true'
+        Boolean, Computed("estoque > 0", persisted=True), init=False
     )
 
 
@@ -80,24 +115,34 @@ class ItensPedido:
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     
-    pedido_id: Mapped[int] = mapped_column(ForeignKey("pedidos.id"), nullable=True)
-    produto_id: Mapped[int] = mapped_column(ForeignKey("produtos.id"))
+    pedido_id: Mapped[int] = mapped_column(ForeignKey("pedidos.id"), nullable=True, index=True)
+    produto_id: Mapped[int] = mapped_column(ForeignKey("produtos.id"), index=True)
     
     quantidade: Mapped[int] = mapped_column()
-    preco: Mapped[float] = mapped_column()
+    preco: Mapped[Decimal] = mapped_column(Numeric(12, 2))
 
     pedido: Mapped["Pedido"] = relationship(
         "Pedido",
         back_populates="itens",
+        lazy="raise_on_sql",
+        init=False
+    )
+    produto: Mapped["Produto"] = relationship(
+        "Produto",
+        lazy="raise_on_sql",
         init=False
     )
 
 @table_registry.mapped_as_dataclass
 class Pedido:
     __tablename__ = "pedidos"
+    __table_args__ = (
+        Index("ix_pedidos_created_at_live", "created_at", postgresql_where=text("deleted = false")),
+        Index("ix_pedidos_cliente_id_status_live", "cliente_id", "status", postgresql_where=text("deleted = false")),
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
-    cliente_id: Mapped[str] = mapped_column(ForeignKey("clients.id"))
+    cliente_id: Mapped[int] = mapped_column(ForeignKey("clients.id"))
     status: Mapped[str] = mapped_column(String)
 
     created_at: Mapped[datetime] = mapped_column(
@@ -110,9 +155,10 @@ class Pedido:
     itens: Mapped[list["ItensPedido"]] = relationship(
         "ItensPedido",
         back_populates="pedido",
+        lazy="raise_on_sql",
         init=False
     )
-    preco_total: Mapped[float] = mapped_column()
+    preco_total: Mapped[Decimal] = mapped_column(Numeric(12, 2))
     deleted: Mapped[bool] = mapped_column(
         Boolean, default=False, server_default='false'
     )
\ No newline at end of file
@@ -1,4 +1,23 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import AfterValidator, BaseModel, Field, WithJsonSchema
+from pydantic.networks import validate_email
+from typing import Annotated, Optional
+from datetime import date
+from decimal import Decimal
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def _validar_email(email: str) -> str:
+    return validate_email(email)[1]
+
+
+# Mesma validação do `EmailStr`, guardando o resultado dos e-mails já vistos.
+# E-mails inválidos levantam erro e não entram no cache.
+EmailStr = Annotated[
+    str,
+    AfterValidator(_validar_email),
+    WithJsonSchema({"type": "string", "format": "email"}),
+]
 
 
 class UserSchema(BaseModel):
@@ -9,4 +28,84 @@ class UserSchema(BaseModel):
 
 class Token(BaseModel):
     access_token: str
-    token_type: str   
\ No newline at end of file
+    token_type: str
+
+
+class ClienteOut(BaseModel):
+    id: int
+    nome: str
+    email: str
+    cpf: str
+
+
+class ClienteResponse(BaseModel):
+    status: str
+    message: str
+    usuario: str
+    cliente: ClienteOut
+
+
+class ClientesResponse(BaseModel):
+    status: str
+    usuario: str
+    message: str
+    total: int
+    clientes: list[ClienteOut]
+
+
+class ClienteCreate(BaseModel):
+    nome: str = Field(min_length=1)
+    email: EmailStr
+    cpf: str = Field(min_length=11)
+
+
+class ClienteUpdate(BaseModel):
+    nome: Optional[str] = Field(None, min_length=1)
+    email: Optional[EmailStr] = None
+    cpf: Optional[str] = Field(None, min_length=11)
+
+
+class LoginIn(BaseModel):
+    username: str = Field(min_length=1)
+    senha: str = Field(min_length=1)
+
+
+class RegisterIn(BaseModel):
+    username: str = Field(min_length=1)
+    email: EmailStr
+    senha: str = Field(min_length=1)
+
+
+class ProdutoCreate(BaseModel):
+    descricao: str = Field(min_length=1)
+    codigo_barras: str = Field(min_length=1)
+    estoque: int = Field(ge=0)
+    data_validade: date
+    preco: Decimal = Field(ge=0, max_digits=12, decimal_places=2)
+    categoria: str = Field(min_length=1)
+    imagens: list[str] = []
+
+
+class ProdutoUpdate(BaseModel):
+    descricao: Optional[str] = Field(None, min_length=1)
+    codigo_barras: Optional[str] = Field(None, min_length=1)
+    estoque: Optional[int] = Field(None, ge=0)
+    data_validade: Optional[date] = None
+    preco: Optional[Decimal] = Field(None, ge=0, max_digits=12, decimal_places=2)
+    categoria: Optional[str] = Field(None, min_length=1)
+    imagens: Optional[list[str]] = None
+
+
+class ItemPedidoIn(BaseModel):
+    produto_id: int
+    quantidade: int = Field(gt=0)
+
+
+class PedidoCreate(BaseModel):
+    cliente_id: int
+    produtos: list[ItemPedidoIn] = Field(min_length=1)
+
+
+class PedidoUpdate(BaseModel):
+    cliente_id: Optional[int] = None
+    status: Optional[str] = Field(None, min_length=1)
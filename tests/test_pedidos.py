@@ -0,0 +1,62 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+from sqlalchemy import Integer
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.selectable import Values
+
+from apps.pedidos.pedidos import _PEDIDOS_DA_SECAO, _LISTAR_PEDIDOS, _baixar_estoque, _total_do_pedido
+from models import ItensPedido, Pedido, Produto
+
+
+def test_secao_filtra_pedidos_por_semi_join_nos_itens():
+    assert _PEDIDOS_DA_SECAO.operator is operators.in_op
+    assert _PEDIDOS_DA_SECAO.left.compare(Pedido.__table__.c.id)
+
+    subconsulta = _PEDIDOS_DA_SECAO.right.element
+    assert [coluna.key for coluna in subconsulta.selected_columns] == ["pedido_id"]
+
+    (juncao,) = subconsulta.get_final_froms()
+    assert {juncao.left.name, juncao.right.name} == {"itens_pedidos", "produtos"}
+    assert juncao.onclause.compare(Produto.__table__.c.id == ItensPedido.__table__.c.produto_id)
+
+
+def test_secao_usa_o_parametro_secao():
+    compilado = _LISTAR_PEDIDOS.where(_PEDIDOS_DA_SECAO).compile(dialect=asyncpg.dialect())
+
+    assert list(compilado.params) == ["secao"]
+
+
+def test_total_do_pedido_multiplica_preco_pela_quantidade():
+    db_produtos = {
+        1: SimpleNamespace(preco=Decimal("2.50")),
+        2: SimpleNamespace(preco=Decimal("0.10")),
+    }
+
+    assert _total_do_pedido(db_produtos, {1: 4, 2: 3}) == Decimal("10.30")
+
+
+def test_total_do_pedido_de_um_unico_item():
+    db_produtos = {7: SimpleNamespace(preco=Decimal("4.00"))}
+
+    assert _total_do_pedido(db_produtos, {7: 1}) == Decimal("4.00")
+
+
+def test_baixa_de_estoque_em_um_unico_update_from_values():
+    comando = _baixar_estoque({1: 3, 2: 1})
+
+    assert comando.table is Produto.__table__
+    assert comando.whereclause.left.compare(Produto.__table__.c.id)
+
+    baixa = comando.whereclause.right.table
+    assert isinstance(baixa, Values)
+    assert list(baixa.c.keys()) == ["produto_id", "quantidade"]
+
+
+def test_baixa_de_estoque_envia_pares_inteiros_na_ordem():
+    compilado = _baixar_estoque({1: 3, 2: 1}).compile(dialect=asyncpg.dialect())
+
+    # Sem o tipo Integer o asyncpg enviaria as colunas do VALUES como texto.
+    assert all(isinstance(bind.type, Integer) for bind in compilado.binds.values())
+    assert [compilado.params[nome] for nome in compilado.positiontup] == [1, 3, 2, 1]
@@ -0,0 +1,23 @@
+from decimal import Decimal
+
+import orjson
+import pytest
+
+from helpers.resposta import ORJSONResponse, _padrao_json
+
+
+def test_decimal_vira_texto_exato():
+    resposta = ORJSONResponse(content={"preco": Decimal("10.30"), "total": Decimal("0.10") * 3})
+
+    assert orjson.loads(resposta.body) == {"preco": "10.30", "total": "0.30"}
+
+
+def test_padrao_json_mantem_a_escala_do_decimal():
+    assert _padrao_json(Decimal("5.00")) == "5.00"
+
+
+def test_tipos_desconhecidos_continuam_com_erro():
+    with pytest.raises(TypeError):
+        ORJSONResponse(content={"valor": object()})
+    with pytest.raises(TypeError):
+        _padrao_json(object())
@@ -0,0 +1,43 @@
+import pytest
+from pydantic import ValidationError
+
+from schemas import ClienteCreate, ClienteUpdate, RegisterIn, _validar_email
+
+
+def setup_function():
+    _validar_email.cache_clear()
+
+
+def test_email_valido_e_normalizado():
+    usuario = RegisterIn(username="ana", email="Ana@Example.COM", senha="x")
+
+    assert usuario.email == "Ana@example.com"
+
+
+def test_email_repetido_usa_o_cache():
+    ClienteCreate(nome="Ana", email="ana@example.com", cpf="12345678900")
+    ClienteCreate(nome="Ana", email="ana@example.com", cpf="12345678900")
+
+    info = _validar_email.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_email_invalido_continua_rejeitado_e_nao_e_guardado():
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            ClienteCreate(nome="Ana", email="sem-arroba", cpf="12345678900")
+
+    info = _validar_email.cache_info()
+    assert (info.hits, info.currsize) == (0, 0)
+
+
+def test_email_opcional_aceita_none():
+    assert ClienteUpdate(email=None).email is None
+    assert _validar_email.cache_info().misses == 0
+
+
+def test_schema_openapi_mantem_formato_email():
+    propriedade = ClienteCreate.model_json_schema()["properties"]["email"]
+
+    assert propriedade["type"] == "string"
+    assert propriedade["format"] == "email"